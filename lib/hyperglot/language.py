@@ -1,3 +1,4 @@
+import functools
 import logging
 from .parse import parse_chars
 from . import SUPPORTLEVELS
@@ -5,6 +6,16 @@ from . import SUPPORTLEVELS
 log = logging.getLogger(__name__)
 
 
+@functools.lru_cache(maxsize=None)
+def _parse_charset(chars):
+    """
+    Return the frozenset of the parsed characters. Cached, so that the same
+    characters of an orthography are parsed only once across all support
+    checks, and languages with the same characters share one set
+    """
+    return frozenset(parse_chars(chars))
+
+
 class Language(dict):
     """
     A dict wrapper around a language data yaml entry with additional querying
@@ -14,6 +25,10 @@ class Language(dict):
     getters
     """
 
+    # Languages get created for every language in each support check, so
+    # avoid a per instance attribute dict for the iso code
+    __slots__ = ("iso",)
+
     def __init__(self, data, iso):
         """
         Init a single Language with the data from rosetta.yaml
@@ -29,6 +44,14 @@ class Language(dict):
     def __repr__(self):
         return "Language object '%s'" % self.get_name()
 
+    # Without an attribute dict pickle protocols 0 and 1 need these to
+    # restore the iso code
+    def __getstate__(self):
+        return {"iso": self.iso}
+
+    def __setstate__(self, state):
+        self.iso = state["iso"]
+
     def get_orthography(self, script=None, status=None):
         """
         Get the most appropriate orthography, or one specifically matching the
@@ -177,25 +200,22 @@ class Language(dict):
         """
         Get a character list from an orthography.
         This also abstracts combining 'preferred_as_group' for special cases.
-        @return set or bool
+        @return frozenset or bool
         """
         combined = []
 
         if "preferred_as_group" not in orthography or ignoreMerge:
-            if attr in orthography:
-                combined = orthography[attr]
+            combined = orthography.get(attr, [])
         else:
             for o in self["orthographies"]:
-                if attr not in o:
-                    continue
-
-                if "preferred_as_group" in o and attr in o:
+                if attr in o and "preferred_as_group" in o:
                     combined = combined + list(o[attr])
 
         if combined == []:
             return False
 
-        return set(parse_chars(combined))
+        # Parsing a list joins it to a string anyway, so use that as the key
+        return _parse_charset("".join(combined))
 
     def has_support(self, chars, level="base", decomposed=False,
                     checkAllOrthographies=False,
@@ -216,7 +236,7 @@ class Language(dict):
         if "orthographies" not in self:
             return support
 
-        if level not in SUPPORTLEVELS.keys():
+        if level not in SUPPORTLEVELS:
             log.warning("Provided support level '%s' not valid, "
                         "defaulting to 'base'" % level)
             level = "base"
@@ -247,25 +267,25 @@ class Language(dict):
             # Any support check needs 'base'
             base = self.get_orthography_chars(ort, "base",
                                               checkAllOrthographies)
-            # and 'marks'
-            marks = self.get_orthography_chars(ort, "marks",
-                                               checkAllOrthographies)
 
             if base:
+                # and 'marks', which are only needed if there is a 'base'
+                marks = self.get_orthography_chars(ort, "marks",
+                                                   checkAllOrthographies)
                 if marks:
-                    base = set(list(base) + list(marks))
+                    base = base | marks
 
                 script = ort["script"]
                 supported = base.issubset(chars)
 
-                if supported:
+                if supported and level == "aux":
                     # Only check aux if base is supported to begin with
                     # and level is "aux" and orthography has "auxiliary"
                     # defined - if orthography has no "auxiliary" we consider
                     # it supported on "auxiliary" level, too
                     aux = self.get_orthography_chars(ort, "auxiliary",
                                                      checkAllOrthographies)
-                    if level == "aux" and aux:
+                    if aux:
                         supported = aux.issubset(chars)
 
             if supported:
@@ -1,16 +1,102 @@
 """
 Helper classes to work with the rosetta.yaml data in more pythonic way
 """
+import os
+import sys
 import yaml
+import pickle
+import hashlib
 import logging
-import unicodedata2
-from .parse import parse_chars
+import tempfile
+from .parse import parse_chars, strip_marks
 from .language import Language
-from . import DB, VALIDITYLEVELS, SUPPORTLEVELS
+from . import DB, VALIDITYLEVELS, SUPPORTLEVELS, __version__
 
 log = logging.getLogger(__name__)
 log.setLevel(logging.WARNING)
 
+# The order of each validity level, to compare levels without list lookups
+_VALIDITY_ORDER = {level: i for i, level in enumerate(VALIDITYLEVELS)}
+
+# Prefer the libyaml C bindings, which are an optional part of PyYAML
+try:
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:
+    from yaml import SafeLoader
+
+
+def _user_cache_dir():
+    """
+    Return the platform's directory for user specific cache files
+    """
+    if sys.platform == "win32":
+        base = os.environ.get("LOCALAPPDATA") or os.path.expanduser("~")
+    elif sys.platform == "darwin":
+        base = os.path.expanduser("~/Library/Caches")
+    else:
+        base = os.environ.get("XDG_CACHE_HOME") or \
+            os.path.expanduser("~/.cache")
+    return os.path.join(base, "hyperglot")
+
+
+# Where load_yaml keeps the parsed yaml data. This is kept out of the
+# installed package, which may be read-only and would not remove the caches
+# on uninstall
+CACHE_DIR = _user_cache_dir()
+
+
+def load_yaml(path, parse=None):
+    """
+    Load and return the data of a yaml file. The parsed data is pickled to
+    CACHE_DIR and used instead of parsing the yaml again for as long as the
+    yaml file has not been modified and the hyperglot version is the same,
+    since a new version may parse the data differently.
+
+    @param path str: Path to the yaml file
+    @param parse function (optional): Called with the open yaml file to
+        return the data instead of loading the entire yaml, e.g. to extract
+        only some of it. Results are cached separately for each function.
+    """
+    path = os.path.abspath(path)
+    header = (__version__, os.stat(path).st_mtime_ns)
+    # Key the cache on the full path, so yaml files of the same name, e.g.
+    # of several installs, do not share a cache
+    name = "%s.%s" % (os.path.basename(path),
+                      hashlib.sha1(path.encode("utf-8")).hexdigest()[:12])
+    if parse is not None:
+        name += "." + parse.__name__
+    cache = os.path.join(CACHE_DIR, name + ".pkl")
+    try:
+        with open(cache, "rb") as f:
+            if pickle.load(f) == header:
+                return pickle.load(f)
+    except (OSError, EOFError, ValueError, pickle.UnpicklingError):
+        pass
+
+    with open(path) as f:
+        if parse is None:
+            data = yaml.load(f, Loader=SafeLoader)
+        else:
+            data = parse(f)
+
+    # Write to a temporary file and move that in place, so an interrupted or
+    # concurrent run never leaves a partially written cache
+    tmp = None
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        with tempfile.NamedTemporaryFile("wb", dir=CACHE_DIR, prefix=name,
+                                         suffix=".tmp", delete=False) as f:
+            tmp = f.name
+            pickle.dump(header, f, pickle.HIGHEST_PROTOCOL)
+            pickle.dump(data, f, pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, cache)
+    except OSError as e:
+        log.debug("Could not write yaml cache '%s': %s" % (cache, e))
+        if tmp is not None and os.path.exists(tmp):
+            os.remove(tmp)
+
+    return data
+
 
 class Languages(dict):
     """
@@ -35,24 +121,22 @@ class Languages(dict):
             "verified". Defaults to "draft" — all languages with basic
             information, but possibly unconfirmed.
         """
-        with open(DB) as f:
-            data = yaml.load(f, Loader=yaml.Loader)
-            self.update(data)
+        self.update(load_yaml(DB))
 
-            if inherit:
-                self.inherit_orthographies_from_macrolanguage()
-                self.inherit_orthographies()
+        if inherit:
+            self.inherit_orthographies_from_macrolanguage()
+            self.inherit_orthographies()
 
-            if not strict:
-                self.lax_macrolanguages()
+        if not strict:
+            self.lax_macrolanguages()
 
-            self.filter_by_validity(validity)
-            self.set_defaults()
+        self.filter_by_validity(validity)
+        self.set_defaults()
 
-            if prune:
-                # Transform all orthography character lists to pruned python
-                # sets; this will decompose and remove precomposed chars
-                self.prune_chars(pruneRetainDecomposed)
+        if prune:
+            # Transform all orthography character lists to pruned python
+            # sets; this will decompose and remove precomposed chars
+            self.prune_chars(pruneRetainDecomposed)
 
     def __repr__(self):
         return "Languages DB dict with '%d' languages" % len(self.keys())
@@ -81,16 +165,19 @@ class Languages(dict):
                     for type in ["base", "auxiliary", "numerals",
                                  "punctuation", "marks"]:
                         if type in o:
-                            o[type] = parse_chars(o[type], True,
-                                                  retainDecomposed)
+                            chars = parse_chars(o[type], True,
+                                                retainDecomposed)
                             if type == "base":
-                                o[type] = [c for c in o[type]
-                                           if not unicodedata2.category(c).startswith("M")]  # noqa
+                                chars = strip_marks(chars)
+                            # The same characters appear in many languages,
+                            # so store only one copy of each
+                            o[type] = [sys.intern(c) for c in chars]
                     # Remove any components in auxiliary after decomposition
                     # that are already in base
                     if "base" in o and "auxiliary" in o:
+                        base = set(o["base"])
                         o["auxiliary"] = [a for a in o["auxiliary"]
-                                          if a not in o["base"]]
+                                          if a not in base]
 
     def lax_macrolanguages(self):
         """
@@ -124,6 +211,9 @@ class Languages(dict):
         Check through all languages and if an orthography inherits from another
         language copy those orthographies
         """
+        # Orthographies already inherited from, by iso and script, so that a
+        # language inherited by several others is only looked up once
+        cache = {}
         for iso, lang in self.items():
             if "orthographies" in lang:
                 for o in lang["orthographies"]:
@@ -140,9 +230,10 @@ class Languages(dict):
                                         "found" % (iso, parent_iso))
                             continue
 
-                        o = self.inherit_orthography(parent_iso, o, iso)
+                        o = self.inherit_orthography(parent_iso, o, iso,
+                                                     cache)
 
-    def inherit_orthography(self, source_iso, extend, iso=""):
+    def inherit_orthography(self, source_iso, extend, iso="", cache=None):
         """
         Return an orthography dict that has been extended by the source iso's
         orthography.
@@ -154,16 +245,25 @@ class Languages(dict):
             inheriting to. If an orthography inherits more than once we do not
             have the inheriting's language context, so do not know the iso code
             to which this orthography belongs to in that case
+        @param cache dict (optional): Source orthographies that have already
+            been looked up (and inherited themselves), keyed by iso and script
         """
         logging.debug("Inherit orthography from '%s' to '%s'" % (source_iso,
                                                                  iso))
 
-        ref = Language(self[source_iso], source_iso)
-        ort = ref.get_orthography(extend["script"])
-        if "inherit" in ort:
-            logging.debug("Multiple levels of inheritence from '%s'" %
-                          source_iso)
-            ort = self.inherit_orthography(ort["inherit"], ort)
+        key = (source_iso, extend["script"])
+        if cache is not None and key in cache:
+            ort = cache[key]
+        else:
+            ref = Language(self[source_iso], source_iso)
+            ort = ref.get_orthography(extend["script"])
+            if "inherit" in ort:
+                logging.debug("Multiple levels of inheritence from '%s'" %
+                              source_iso)
+                ort = self.inherit_orthography(ort["inherit"], ort,
+                                               cache=cache)
+            if cache is not None:
+                cache[key] = ort
 
         if ort:
             log.debug("'%s' inheriting orthography from "
@@ -199,30 +299,36 @@ class Languages(dict):
         If so, apply the macrolanguage's orthographies to this language
         """
 
-        macrolanguages = {iso: lang for iso,
-                          lang in self.items() if "includes" in lang}
-
-        for lang in self:
-            if "orthographies" not in self:
-
-                for iso, m in macrolanguages.items():
-                    if lang in m["includes"] and "orthographies" in m:
-                        log.debug("Inheriting macrolanguage '%s' "
-                                  "orthographies to language '%s'"
-                                  % (iso, lang))
-        # Make an explicit copy to keep the two languages
-        # separate
-        self[lang]["orthographies"] = m["orthographies"].copy()
+        # Map each included language to a macrolanguage with orthographies
+        # that includes it, so every language needs only a single lookup.
+        # Should several macrolanguages include the same language the last
+        # one in the data is used, same as a lookup through all of them in
+        # order would.
+        macrolanguages = {}
+        for iso, m in self.items():
+            if "includes" in m and "orthographies" in m:
+                for included in m["includes"]:
+                    macrolanguages[included] = iso
+
+        for lang, data in self.items():
+            if "orthographies" not in data and lang in macrolanguages:
+                iso = macrolanguages[lang]
+                log.debug("Inheriting macrolanguage '%s' "
+                          "orthographies to language '%s'"
+                          % (iso, lang))
+                # Make an explicit copy to keep the two languages
+                # separate
+                data["orthographies"] = self[iso]["orthographies"].copy()
 
     def filter_by_validity(self, validity):
         if validity not in VALIDITYLEVELS:
             raise ValueError("Validity level '%s' not valid, must be one of: "
                              ", ".join(VALIDITYLEVELS) % validity)
 
-        allowed = VALIDITYLEVELS.index(validity)
+        allowed = _VALIDITY_ORDER[validity]
         pruned = {}
         for iso, lang in self.items():
-            if VALIDITYLEVELS.index(lang["validity"]) >= allowed:
+            if _VALIDITY_ORDER[lang["validity"]] >= allowed:
                 pruned[iso] = lang
 
         self.clear()
@@ -257,22 +363,24 @@ class Languages(dict):
         """
         chars = set(chars)
         support = {}
+        allowed = _VALIDITY_ORDER[validity]
 
-        for lang in self:
-            l = Language(self[lang], lang)  # noqa, let's keep l short
-
-            if "validity" not in l:
+        for lang, data in self.items():
+            # Check validity on the raw data, so skipped languages do not need
+            # a Language object
+            if "validity" not in data:
                 log.info("Skipping langauge '%s' which is missing "
                          "'validity'" % lang)
                 continue
 
             # Skip languages below the currently selected validity level
-            if VALIDITYLEVELS.index(l["validity"]) < \
-                    VALIDITYLEVELS.index(validity):
+            if _VALIDITY_ORDER[data["validity"]] < allowed:
                 log.info("Skipping language '%s' which has lower "
                          "'validity'" % lang)
                 continue
 
+            l = Language(data, lang)  # noqa, let's keep l short
+
             if includeHistorical and l.is_historical():
                 log.info("Including historical language '%s'" %
                          l.get_name())
@@ -295,13 +403,12 @@ class Languages(dict):
                                      checkAllOrthographies=includeAllOrthographies,  # noqa
                                      pruneOrthographies=pruneOrthographies)
 
-            for script in lang_sup:
-                for script, isos in lang_sup.items():
-                    if script not in support.keys():
-                        support[script] = {}
-                    for iso in isos:
-                        # Note we are adding the pruned language object that
-                        # has_support has updated
-                        support[script][iso] = l
+            for script, isos in lang_sup.items():
+                if script not in support:
+                    support[script] = {}
+                for iso in isos:
+                    # Note we are adding the pruned language object that
+                    # has_support has updated
+                    support[script][iso] = l
 
         return support
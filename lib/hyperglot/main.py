@@ -3,7 +3,6 @@ import os
 import re
 import yaml
 import logging
-import unicodedata2 as uni
 from collections import OrderedDict
 from fontTools.ttLib import TTFont
 from . import __version__, DB, SUPPORTLEVELS, VALIDITYLEVELS
@@ -11,7 +10,8 @@ from .languages import Languages
 from .language import Language
 # from .validate import validate
 from .parse import (prune_superflous_marks,
-                    parse_font_chars, parse_chars, parse_marks)
+                    parse_font_chars, parse_chars, parse_marks,
+                    strip_marks)
 
 log = logging.getLogger(__name__)
 log.setLevel(logging.WARNING)
@@ -237,10 +237,13 @@ def cli(fonts, support, decomposed, validity, autonyms, users, output, mode,
     # A dict with each file and its results for each script
     results = {}
 
+    # Checking support does not modify the languages, so they can be loaded
+    # once for all fonts
+    Lang = Languages(strict=strict_iso, prune=False)
+
     for font in fonts:
         chars = parse_font_chars(font)
 
-        Lang = Languages(strict=strict_iso, prune=False)
         langs = Lang.get_support_from_chars(
             chars, support, validity, decomposed, include_all_orthographies,
             include_historical, include_constructed)
@@ -337,8 +340,8 @@ def save_sorted(Langs=None):
                         # Do not include anything (after decomposition)
                         # that is already listed in base
                         if "base" in o and type != "base":
-                            chars = [
-                                c for c in chars if c not in o["base"]]
+                            base = set(o["base"])
+                            chars = [c for c in chars if c not in base]
 
                         joined = " ".join(chars)
 
@@ -366,9 +369,7 @@ def save_sorted(Langs=None):
                             " ".join(o["base"]))
 
                         # Save base without marks
-                        _base = [c for c in base
-                                 if not uni.category(c).startswith("M")]
-                        o["base"] = " ".join(_base)
+                        o["base"] = " ".join(strip_marks(base))
 
     # Sort by keys
     alphabetic = dict(OrderedDict(sorted(Langs.items())))
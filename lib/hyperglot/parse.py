@@ -1,4 +1,6 @@
 import unicodedata2
+import functools
+import itertools
 import logging
 import re
 from fontTools.ttLib import TTFont
@@ -6,6 +8,67 @@ from fontTools.ttLib import TTFont
 log = logging.getLogger(__name__)
 log.setLevel(logging.INFO)
 
+_RE_NONASCII = re.compile(r"[^\x00-\x7f]")
+_RE_WHITESPACE = re.compile(r"\s")
+
+# Not _entirely_ sure why the following can be parts of the
+# decomposition but let's ignore them when encountered. Some glyphs
+# decompose to these kind of parts instead of uni hex, presumambly
+# as layout hints based on the glyph context
+# Match and ignore them for now
+# e.g. <isolated> <compat> <super> <vertical> <final> <medial>
+# <initial> <sub> <fraction> <font> <wide> <narrow>
+_RE_IN_BRACKETS = re.compile(r"^<\w+\>$")
+
+
+# Codepoints below this are looked up in the table of marks, which covers all
+# planes with assigned characters but the special purpose and private use ones
+_MARK_TABLE_SIZE = 0x30000
+# One byte per codepoint, 1 for marks; built on first use of is_mark
+_mark_table = None
+
+
+def is_mark(c):
+    """
+    Check if a character is a mark, i.e. its unicode category is Mn, Mc or Me
+    """
+    global _mark_table
+    cp = ord(c)
+    if cp >= _MARK_TABLE_SIZE:
+        return unicodedata2.category(c).startswith("M")
+    if _mark_table is None:
+        _mark_table = bytes(unicodedata2.category(chr(i)).startswith("M")
+                            for i in range(_MARK_TABLE_SIZE))
+    return _mark_table[cp] == 1
+
+
+# str.translate table deleting all marks, built on first use of strip_marks
+_strip_marks_table = None
+
+
+def strip_marks(chars):
+    """
+    Return a list of the characters without any marks
+
+    @param chars str or list: Characters, lists must be of single characters
+    """
+    global _strip_marks_table
+    if _strip_marks_table is None:
+        # Above the is_mark table only the supplementary special purpose plane
+        # has marks (variation selectors)
+        cps = itertools.chain(range(_MARK_TABLE_SIZE), range(0xE0000, 0xF0000))
+        _strip_marks_table = dict.fromkeys(
+            cp for cp in cps if is_mark(chr(cp)))
+    return list("".join(chars).translate(_strip_marks_table))
+
+
+def is_ascii(string):
+    """
+    Check if a string contains only ASCII characters, e.g. to skip unicode
+    lookups that cannot apply to ASCII (str.isascii needs Python 3.7)
+    """
+    return _RE_NONASCII.search(string) is None
+
 
 def list_unique(li):
     """
@@ -14,9 +77,16 @@ def list_unique(li):
     if type(li) is not list:
         raise ValueError("list_unique expected list, but got '%s' of type '%s'"
                          % (li, type(li)))
-    seen = set()
-    seen_add = seen.add
-    return [x for x in li if not (x in seen or seen_add(x))]
+    return list(dict.fromkeys(li))
+
+
+@functools.lru_cache(maxsize=8192)
+def _normalize_nfc(string):
+    """
+    Return the NFC normalized string. Cached, since the same orthography
+    strings get parsed again and again, e.g. for each font checked
+    """
+    return unicodedata2.normalize("NFC", string)
 
 
 def character_list_from_string(string, normalize=True):
@@ -44,11 +114,11 @@ def character_list_from_string(string, normalize=True):
 
         # N_ormal F_orm C_omposed
         # See more https://docs.python.org/3/library/unicodedata.html#unicodedata.normalize # noqa
-        string = unicodedata2.normalize("NFC", string)
+        # ASCII strings are always normalized
+        if not is_ascii(string):
+            string = _normalize_nfc(string)
 
-    li = list(string)
-    li = list_unique([c for c in li if c.strip() != ""])
-    return li
+    return list_unique([c for c in string if not c.isspace()])
 
 
 def sort_key_character_category(c):
@@ -78,6 +148,32 @@ def sort_by_character_type(chars):
     return sorted(chars, key=sort_key_character_category)
 
 
+@functools.lru_cache(maxsize=None)
+def _decompose(c):
+    """
+    Return a tuple of the characters a character decomposes to, or None if it
+    cannot be decomposed. Cached, since the orthographies only use a limited
+    set of characters which get decomposed again and again
+    """
+    # decomposition is either "" or a space separated string of
+    # zero-filled unicode hex values like "0075 0308"
+    decomposition = unicodedata2.decomposition(c)
+    if decomposition == "":
+        return None
+
+    parts = []
+    for unihexstr in decomposition.split(" "):
+        if _RE_IN_BRACKETS.match(unihexstr):
+            continue
+        try:
+            parts.append(chr(int(unihexstr, 16)))
+        except Exception as e:
+            log.error("Error getting glyph from decomposition "
+                      "part '%s' of '%s' (decomposition '%s'):"
+                      " %s" % (unihexstr, c, decomposition, e))
+    return tuple(parts)
+
+
 def parse_chars(characters, decompose=True, retainDecomposed=False):
     """
     From a string of characters get a set of unique unicode codepoints needed
@@ -89,46 +185,30 @@ def parse_chars(characters, decompose=True, retainDecomposed=False):
     """
     unique_chars = []
     try:
-        unique_strings = "".join(character_list_from_string(characters))
+        unique_strings = character_list_from_string(characters)
         additional = []
 
         if not decompose:
             # If we want to just get the string of characters as a list without
             # doing any decomposition return a list of unique, space separated,
             # strings
-            return character_list_from_string(unique_strings, False)
+            return unique_strings
 
-        for c in unique_strings:
+        if is_ascii("".join(unique_strings)):
+            # ASCII characters have no decompositions
+            return unique_strings
 
-            # decomposition is either "" or a space separated string of
-            # zero-filled unicode hex values like "0075 0308"
-            decomposition = unicodedata2.decomposition(c)
+        for c in unique_strings:
+            decomposition = _decompose(c)
 
             # This glyph should be part of the list if either it cannot be
             # decomposed or if we want to keep also decomposable ones (e.g.
             # when pruning and saving the DB)
-            if decomposition == "" or retainDecomposed:
+            if decomposition is None or retainDecomposed:
                 unique_chars.append(c)
 
-            # Not _entirely_ sure why the following can be parts of the
-            # decomposition but let's ignore them when encountered. Some glyphs
-            # decompose to these kind of parts instead of uni hex, presumambly
-            # as layout hints based on the glyph context
-            # Match and ignore them for now
-            # e.g. <isolated> <compat> <super> <vertical> <final> <medial>
-            # <initial> <sub> <fraction> <font> <wide> <narrow>
-            inbrackets = re.compile(r"^<\w+\>$")
-
-            if decomposition != "":
-                for unihexstr in decomposition.split(" "):
-                    if inbrackets.match(unihexstr):
-                        continue
-                    try:
-                        additional.append(chr(int(unihexstr, 16)))
-                    except Exception as e:
-                        log.error("Error getting glyph from decomposition "
-                                  "part '%s' of '%s' (decomposition '%s'):"
-                                  " %s" % (unihexstr, c, decomposition, e))
+            if decomposition is not None:
+                additional.extend(decomposition)
 
         # Append additional chars retrieved from decomposition to the end, but
         # sort those so that we have letters, then marks, then anything else
@@ -139,7 +219,7 @@ def parse_chars(characters, decompose=True, retainDecomposed=False):
         log.error("Error parsing characters '%s': %s" % (characters, e))
 
     return list_unique([u for u in unique_chars
-                        if not re.match(r"\s", u) and len(u) != 0])
+                        if not _RE_WHITESPACE.match(u) and len(u) != 0])
 
 
 def prune_superflous_marks(string):
@@ -154,14 +234,21 @@ def prune_superflous_marks(string):
     unique_strings = character_list_from_string(string)
     removed = []
 
-    for c in unique_strings:
-        # No need to bother about glyph clusters with more than one character,
-        # since that inherently will not be a mistakenly listed mark
-        if len(c) > 1:
-            continue
-        if unicodedata2.category(c).startswith("M"):
+    # There are no marks in ASCII
+    if is_ascii("".join(unique_strings)):
+        return unique_strings, ()
+
+    # No need to bother about glyph clusters with more than one character,
+    # since that inherently will not be a mistakenly listed mark
+    marks = [c for c in unique_strings
+             if len(c) == 1 and is_mark(c)]
+
+    if marks:
+        # Decompose each character once, not once for every mark
+        decomposed = {s: set(parse_chars(s)) for s in unique_strings}
+        for c in marks:
             for s in unique_strings:
-                if s != c and c in parse_chars(s):
+                if s != c and c in decomposed[s]:
                     removed.append(c)
 
     if removed == []:
@@ -191,4 +278,4 @@ def parse_marks(input):
     From a space separated string
     """
     chars = parse_chars(input)
-    return [c for c in chars if unicodedata2.category(c).startswith("M")]
+    return [c for c in chars if is_mark(c)]
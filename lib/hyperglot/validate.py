@@ -5,14 +5,16 @@ Note that the python library itself is tested with pytest, whereas this is more
 of a check for the data file to be used when entering and saving data.
 """
 import logging
+import functools
 import colorlog
 import yaml
 import os
 import re
+import sys
 import unicodedata2
-from .languages import Languages
-from .parse import (parse_chars, prune_superflous_marks)
-from . import (STATUSES, VALIDITYLEVELS)
+from .languages import Languages, load_yaml, SafeLoader
+from .parse import (parse_chars, prune_superflous_marks, is_ascii)
+from . import (DB, STATUSES, VALIDITYLEVELS)
 
 handler = colorlog.StreamHandler()
 handler.setFormatter(colorlog.ColoredFormatter('%(log_color)s%(message)s'))
@@ -20,24 +22,106 @@ log = colorlog.getLogger(__name__)
 log.setLevel(logging.DEBUG)
 log.addHandler(handler)
 
+
+# Precompiled patterns used when validating every orthography in the data
+_RE_GLYPH_SEPARATORS = re.compile(r"(?P<newline>\n)|(?P<spaces> {2,})")
+_RE_NONDIGIT = re.compile(r"[^\d]")
+_RE_WHITESPACE = re.compile(r"\s")
+_RE_COMBO_STRIP = re.compile(r"(^\{)|(\}\{)|(\}$)")
+_RE_CURLY = re.compile(r"\{|\}")
+_RE_NONWORD = re.compile(r"\W")
+# The characters of the unicode categories Z (Zs, Zl, Zp) and Sk, as of
+# Unicode 18.0 - hardcoded, since building them from unicodedata2 means a
+# category lookup for every codepoint
+_RE_SEPARATOR = re.compile(
+    r"[\u0020\u00A0\u1680\u2000-\u200A\u2028-\u2029\u202F\u205F\u3000]")
+_RE_MODIFIER_SYMBOL = re.compile(
+    r"[\u005E\u0060\u00A8\u00AF\u00B4\u00B8\u02C2-\u02C5\u02D2-\u02DF"
+    r"\u02E5-\u02EB\u02ED\u02EF-\u02FF\u0375\u0384-\u0385\u0888\u1FBD"
+    r"\u1FBF-\u1FC1\u1FCD-\u1FCF\u1FDD-\u1FDF\u1FED-\u1FEF\u1FFD-\u1FFE"
+    r"\u309B-\u309C\uA700-\uA716\uA720-\uA721\uA789-\uA78A\uAB5B"
+    r"\uAB6A-\uAB6B\uFBB2-\uFBC2\uFF3E\uFF40\uFFE3"
+    r"\U00010EC9-\U00010ECA\U0001F3FB-\U0001F3FF]")
+# str.translate table deleting all ASCII characters _RE_NONWORD matches
+_DELETE_ASCII_NONWORD = dict.fromkeys(
+    cp for cp in range(128) if _RE_NONWORD.match(chr(cp)))
+
+# Keys an orthography may have
+_ORTHOGRAPHY_KEYS = frozenset([
+    "autonym", "inherit", "script", "base", "marks", "auxiliary", "numerals",
+    "status", "note",
+    "punctuation",  # tolerated for now, but unused
+    "preferred_as_group", "design_note"])
+
+_STATUSES = frozenset(STATUSES)
+_VALIDITYLEVELS = frozenset(VALIDITYLEVELS)
+
+
+def parse_iso_names(stream):
+    """
+    Return an iso-keyed dict of name lists from the iso-639-3.yaml stream,
+    with an empty list for any iso without "names"
+
+    Only the names are used for validation, so instead of loading the entire
+    iso data walk the yaml events and keep just the names. Aliased names are
+    not resolved
+    """
+    names = {}
+    # For each open mapping or sequence a list of the key it is nested under
+    # and, for mappings, the key of the value that will be read next (None
+    # while expecting a key)
+    stack = []
+    for event in yaml.parse(stream, Loader=SafeLoader):
+        if isinstance(event, (yaml.ScalarEvent, yaml.AliasEvent)):
+            if not stack:
+                continue
+            # Aliases are not resolved, but still take the place of a key or
+            # value
+            is_scalar = isinstance(event, yaml.ScalarEvent)
+            top = stack[-1]
+            if top[1] is None:
+                # Sequence item
+                if len(stack) == 3 and stack[1][2] == "names" and is_scalar:
+                    names[stack[1][0]].append(event.value)
+            elif top[2] is None:
+                top[2] = event.value if is_scalar else event
+            else:
+                top[2] = None
+        elif isinstance(event, (yaml.MappingStartEvent,
+                                yaml.SequenceStartEvent)):
+            parent = stack[-1][2] if stack else None
+            if len(stack) == 1:
+                names[parent] = []
+            is_mapping = isinstance(event, yaml.MappingStartEvent)
+            stack.append([parent, is_mapping or None, None])
+        elif isinstance(event, (yaml.MappingEndEvent, yaml.SequenceEndEvent)):
+            stack.pop()
+            if stack:
+                # The collection was the value of the parent mapping's key
+                stack[-1][2] = None
+
+    return names
+
+
 ISO_639_3 = "../../other/iso-639-3.yaml"
-try:
-    iso_db = os.path.abspath(os.path.join(os.path.dirname(__file__),
-                                          ISO_639_3))
-    with open(iso_db) as f:
-        iso_data = yaml.load(f, Loader=yaml.Loader)
-except Exception as e:
-    log.error(e)
-    import sys
-    sys.exit()
+ISO_DB = os.path.abspath(os.path.join(os.path.dirname(__file__), ISO_639_3))
+
+
+@functools.lru_cache(maxsize=1)
+def load_languages(mtime):
+    """
+    The languages to validate, cached for as long as the mtime of the
+    hyperglot.yaml passed in does not change
+    """
+    # Use prune=False to validate the orthographies raw
+    return Languages(prune=False, validity=VALIDITYLEVELS[0])
 
 
 def check_yaml():
 
     try:
         log.debug("YAML file structure ok and can be read")
-        # Use prune=False to validate the orthographies raw
-        return Languages(prune=False, validity=VALIDITYLEVELS[0])
+        return load_languages(os.stat(DB).st_mtime_ns)
     except yaml.scanner.ScannerError as e:
         log.error("Malformed yaml:")
         print(e)
@@ -50,82 +134,72 @@ def check_types(Langs):
     for iso, lang in Langs.items():
         if "includes" in lang:
             if not check_is_valid_list(lang["includes"]):
-                log.error("'%s' has invalid list 'includes'" % iso)
+                log.error("'%s' has invalid list 'includes'", iso)
 
         if "source" in lang:
             if not check_is_valid_list(lang["source"]):
-                log.error("'%s' has invalid list 'source'" % iso)
+                log.error("'%s' has invalid list 'source'", iso)
 
         if "orthographies" in lang:
             if not check_is_valid_list(lang["orthographies"]):
-                log.error("'%s' has invalid list 'orthographies'" % iso)
+                log.error("'%s' has invalid list 'orthographies'", iso)
 
             for o in lang["orthographies"]:
                 if "base" in o:
                     if iso == "arg":
-                        chars = list(o["base"].replace(" ", ""))
-                        for i, c in enumerate(chars):
-                            if unicodedata2.category(c).startswith("Z"):
-                                log.error("'%s' has invalid whitespace "
-                                          "characters '%s' at %d" %
-                                          (iso, unicodedata2.name(c), i))
+                        chars = o["base"].replace(" ", "")
+                        for m in _RE_SEPARATOR.finditer(chars):
+                            log.error("'%s' has invalid whitespace "
+                                      "characters '%s' at %d", iso,
+                                      unicodedata2.name(m.group()), m.start())
 
                     if not check_is_valid_glyph_string(o["base"], iso):
-                        log.error("'%s' has invalid 'base' glyph list"
-                                  % iso)
+                        log.error("'%s' has invalid 'base' glyph list", iso)
 
                 if "auxiliary" in o:
                     if not check_is_valid_glyph_string(o["auxiliary"], iso):
-                        log.error("'%s' has invalid 'auxiliary' glyph list"
-                                  % iso)
-
-                allowed = ["autonym", "inherit", "script", "base", "marks",
-                           "auxiliary", "numerals", "status", "note",
-                           "punctuation",  # tolerated for now, but unused
-                           "preferred_as_group", "design_note"]
-                invalid = [k for k in o.keys() if k not in allowed]
-                if len(invalid):
-                    log.warn("'%s' has invalid orthography keys: '%s'" %
-                             (iso, "', '".join(invalid)))
+                        log.error("'%s' has invalid 'auxiliary' glyph list",
+                                  iso)
+
+                invalid = o.keys() - _ORTHOGRAPHY_KEYS
+                if invalid:
+                    log.warn("'%s' has invalid orthography keys: '%s'",
+                             iso, "', '".join(sorted(invalid)))
 
             primary_orthography = [o for o in lang["orthographies"]
                                    if "status" in o and
                                    o["status"] == "primary"]
             if len(primary_orthography) == 0:
-                log.error("'%s' has no primary orthography" % iso)
+                log.error("'%s' has no primary orthography", iso)
 
         if "name" not in lang and "preferred_name" not in lang:
-            log.error("'%s' has neither 'name' nor 'preferred_name'" % iso)
+            log.error("'%s' has neither 'name' nor 'preferred_name'", iso)
 
         if "name" in lang and "preferred_name" in lang and \
                 lang["name"] == lang["preferred_name"]:
             log.error("'%s' has 'name' and 'preferred_name', but they are "
-                      "identical" % iso)
+                      "identical", iso)
 
-        if "status" in lang and lang["status"] not in STATUSES:
-            log.error("'%s' has an invalid 'status'" % iso)
+        if "status" in lang and lang["status"] not in _STATUSES:
+            log.error("'%s' has an invalid 'status'", iso)
 
         if "validity" not in lang:
-            log.warn("'%s' is missing 'validity'" % iso)
+            log.warn("'%s' is missing 'validity'", iso)
 
-        if "validity" in lang and lang["validity"] not in VALIDITYLEVELS:
-            log.error("'%s' has invalid 'validity'" % iso)
+        if "validity" in lang and lang["validity"] not in _VALIDITYLEVELS:
+            log.error("'%s' has invalid 'validity'", iso)
 
         if "speakers" in lang:
-            if (re.search(r"[^\d]", str(lang["speakers"]))):
+            if _RE_NONDIGIT.search(str(lang["speakers"])):
                 log.error("'%s' has invalid 'speakers' '%s' - only numbers "
-                          "are allowed" %
-                          (iso, lang["speakers"]))
+                          "are allowed", iso, lang["speakers"])
 
 
 def check_is_valid_list(item):
     """
     item should be a list and should not be empty
     """
-    if type(item) is not list or len(item) < 1:
-        return False
-
-    return True
+    return type(item) is list and len(item) != 0
 
 
 def check_is_valid_glyph_string(glyphs, iso=None):
@@ -137,26 +211,25 @@ def check_is_valid_glyph_string(glyphs, iso=None):
         log.error("Do not use empty glyph sequences")
         return False
 
-    if re.findall(r"\n", glyphs):
-        log.error("Glyph sequences should not contain line breaks")
-        return False
-
-    if re.findall(r" {2,}", glyphs):
-        log.error("More than single space in '%s'" % glyphs)
-        print([g for g in re.findall(r" {2,}", glyphs)])
+    # Find line breaks and multiple spaces in a single pass
+    invalid = _RE_GLYPH_SEPARATORS.search(glyphs)
+    if invalid:
+        if invalid.lastgroup == "newline":
+            log.error("Glyph sequences should not contain line breaks")
+        else:
+            log.error("More than single space in '%s'", glyphs)
         return False
 
     pruned, removed = prune_superflous_marks(glyphs)
     if len(removed) > 0:
         log.error("Superflous marks that are implicitly extracted via "
-                  "decomposition: '%s'" % "','".join(removed))
+                  "decomposition: '%s'", "','".join(removed))
         return False
 
-    for c in glyphs:
-        if unicodedata2.category(c) == "Sk":
-            log.warning("'%s' contains modifier symbol '%s' in characters. It "
-                        "is very likely this should be a combining mark "
-                        "instead." % (iso, c))
+    for m in _RE_MODIFIER_SYMBOL.finditer(glyphs):
+        log.warning("'%s' contains modifier symbol '%s' in characters. It "
+                    "is very likely this should be a combining mark "
+                    "instead.", iso, m.group())
 
     return True
 
@@ -170,77 +243,88 @@ def check_is_valid_combation_string(combos):
     if type(combos) is not str or len(combos) == 0:
         return False
 
-    if re.findall(r"\s", combos):
+    if _RE_WHITESPACE.search(combos):
         log.error("'combination' may not contain white space")
         return False
 
     # Remove beginning {, ending }, or pairs of }{ — if any { or } remain,
     # there was a "syntax" error in the data
-    removed = re.sub(r"(^\{)|(\}\{)|(\}$)", "", combos)
-    if re.findall(r"\{|\}", removed):
+    removed = _RE_COMBO_STRIP.sub("", combos)
+    if _RE_CURLY.search(removed):
         log.error("'combination' has invalid pattern of curly braces")
         return False
 
     return True
 
 
-def check_names(Langs):
+def check_names(Langs, iso_data):
+    """
+    @param iso_data dict: iso-keyed iso data "names", see parse_iso_names
+    """
+    iso_names = get_iso_names(iso_data)
     for iso, lang in Langs.items():
         if "orthographies" in lang:
             for o in lang["orthographies"]:
                 if "base" not in o and "inherit" not in o:
                     log.error("'%s' has an orthography which is missing a "
-                              "'base' attribute" % iso)
+                              "'base' attribute", iso)
                     continue
 
                 if "autonym" not in o:
                     continue
 
                 if "script" not in o:
-                    log.error("'%s' has no 'script' attribute" % iso)
+                    log.error("'%s' has no 'script' attribute", iso)
                     continue
 
                 if "inherit" in o:
                     if not check_inheritted(o["inherit"], o["script"], Langs):
                         log.error("'%s' has an orthography which inherits "
                                   "from '%s', but that is not a valid or "
-                                  "existing language" %
-                                  (iso, o["inherit"]))
+                                  "existing language", iso, o["inherit"])
                     continue
                 autonym_ok, chars, missing = check_autonym_spelling(o)
                 if not autonym_ok:
                     log.warn("'%s' has invalid autonym '%s' which cannot "
                              "be spelled with that orthography's charset "
-                             "(base + marks + auxiliary) '%s' - missing '%s'"
-                             % (iso, o["autonym"], "".join(chars),
-                                 "".join(missing)))
+                             "(base + marks + auxiliary) '%s' - missing '%s'",
+                             iso, o["autonym"], "".join(chars),
+                             "".join(missing))
 
-        if iso not in iso_data.keys():
-            log.error("'%s' not found in iso data" % iso)
+        if iso not in iso_data:
+            log.error("'%s' not found in iso data", iso)
         else:
-            if "names" in iso_data[iso]:
-                if lang["name"] not in iso_data[iso]["names"]:
-                    log.info("'%s' name ('%s') differs from iso data ('%s')"
-                             % (iso, lang["name"],
-                                ", ".join(iso_data[iso]["names"])))
+            if iso_data[iso]:
+                if lang["name"] not in iso_names[iso] and \
+                        log.isEnabledFor(logging.INFO):
+                    log.info("'%s' name ('%s') differs from iso data ('%s')",
+                             iso, lang["name"], ", ".join(iso_data[iso]))
             else:
-                log.warning("'%s' has no 'names' attribute in iso data"
-                            % iso)
+                log.warning("'%s' has no 'names' attribute in iso data",
+                            iso)
+
+
+def get_iso_names(iso_data):
+    """
+    Return the iso data names as iso-keyed frozensets for constant time
+    membership tests
+    """
+    return {iso: frozenset(names) for iso, names in iso_data.items()}
 
 
 def check_inheritted(iso, script, Langs):
     if len(iso) != 3:
-        log.warning("'%s' not a valid 3-letter iso code to inherit from" %
+        log.warning("'%s' not a valid 3-letter iso code to inherit from",
                     iso)
         return False
     if iso not in Langs.keys():
-        log.warning("'%s' not found in database" % iso)
+        log.warning("'%s' not found in database", iso)
         return False
 
     parent = Langs[iso]
     if "orthographies" not in parent:
         log.warning(
-            "Cannot inherit from '%s' — has no orthographies" % parent)
+            "Cannot inherit from '%s' — has no orthographies", parent)
         return False
 
         has_valid_orthography = False
@@ -253,19 +337,19 @@ def check_inheritted(iso, script, Langs):
     return True
 
 
-def check_macrolanguages(Langs):
+def check_macrolanguages(Langs, iso_data):
     # Compare with ISO data
-    for iso, lang in iso_data.items():
-        for name in lang["names"]:
-            if "macrolanguage" in name:
-                if iso not in Langs.keys():
-                    log.info("'%s' is marked as macrolanguage in iso "
-                             "data, but does not exist in hyperglot "
-                             "data" % iso)
-                    continue
-                if not check_includes(Langs[iso]):
-                    log.error("'%s' is marked as macrolanguage in the iso "
-                              "data, but has no 'includes'." % iso)
+    macrolanguages = {iso for iso, names in iso_data.items()
+                      if any("macrolanguage" in name for name in names)}
+
+    for iso in sorted(macrolanguages - Langs.keys()):
+        log.info("'%s' is marked as macrolanguage in iso data, but does not "
+                 "exist in hyperglot data", iso)
+
+    for iso in sorted(macrolanguages & Langs.keys()):
+        if not check_includes(Langs[iso]):
+            log.error("'%s' is marked as macrolanguage in the iso data, but "
+                      "has no 'includes'.", iso)
 
     for iso, lang in Langs.items():
         if "includes" in lang:
@@ -278,37 +362,54 @@ def check_macrolanguages(Langs):
                 continue
 
             for i in lang["includes"]:
-                if i not in Langs.keys():
+                if i not in Langs:
                     logging.error("'%s' includes language '%s' but it was "
-                                  "missing from the data" % (iso, i))
+                                  "missing from the data", iso, i)
 
 
 def check_includes(lang):
-    if "includes" not in lang:
-        return False
+    """
+    lang should have a non-empty list of 'includes'
+    """
+    includes = lang.get("includes")
+    return type(includes) is list and len(includes) != 0
 
-    if type(lang["includes"]) is not list:
-        return False
 
-    if len("includes") < 1:
-        return False
+@functools.lru_cache(maxsize=None)
+def _orthography_charset(base, auxiliary=None, marks=None):
+    """
+    Return the set of characters of an orthography's base, auxiliary and
+    marks strings. Cached, since inherited orthographies share the same
+    strings
+    """
+    chars = set(parse_chars(base))
+    if auxiliary is not None:
+        chars.update(parse_chars(auxiliary))
+    if marks is not None:
+        chars.update(parse_chars(marks))
+    return frozenset(chars)
 
-    return True
+
+@functools.lru_cache(maxsize=None)
+def _autonym_charset(autonym):
+    """
+    Return the set of characters of an autonym, lowercased and without
+    non-word characters
+    """
+    autonym = autonym.lower()
+    if is_ascii(autonym):
+        autonym = autonym.translate(_DELETE_ASCII_NONWORD)
+    else:
+        autonym = _RE_NONWORD.sub("", autonym)
+    return frozenset(parse_chars(autonym))
 
 
 def check_autonym_spelling(ort):
-    chars = parse_chars(ort["base"])
-    if "auxiliary" in ort:
-        chars = chars + parse_chars(ort["auxiliary"])
-    if "marks" in ort:
-        chars = chars + parse_chars(ort["marks"])
-    chars = set(chars)
+    chars = _orthography_charset(ort["base"], ort.get("auxiliary"),
+                                 ort.get("marks"))
 
     # Use lowercase no non-word-chars version of autonym
-    autonym = ort["autonym"].lower()
-    autonym = re.sub(r"\W", "", autonym)
-    autonym_chars = parse_chars(autonym)
-    autonym_chars = set(autonym_chars)
+    autonym_chars = _autonym_charset(ort["autonym"])
 
     missing = list(autonym_chars.difference(chars))
 
@@ -323,7 +424,12 @@ def validate():
     log.error("Red = Requires fixing")
     print()
     log.debug("Loading iso-639-3.yaml for names and macro language checks")
+    try:
+        iso_data = load_yaml(ISO_DB, parse_iso_names)
+    except Exception as e:
+        log.error(e)
+        sys.exit()
     Langs = check_yaml()
     check_types(Langs)
-    check_names(Langs)
-    check_macrolanguages(Langs)
+    check_names(Langs, iso_data)
+    check_macrolanguages(Langs, iso_data)
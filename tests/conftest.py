@@ -0,0 +1,13 @@
+"""
+Fixtures shared across the tests
+"""
+import pytest
+from hyperglot.languages import Languages
+
+
+@pytest.fixture(scope="session")
+def langs():
+    """
+    A default Languages object, loaded once for all tests which only read it
+    """
+    return Languages()
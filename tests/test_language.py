@@ -1,16 +1,16 @@
 """
 Basic Language support checks
 """
+import copy
+import pickle
 import pytest
 from hyperglot.languages import Languages
 from hyperglot.language import Language
 
 
-def test_language_has_support():
-    Langs = Languages()
-
+def test_language_has_support(langs):
     # A Language object with the 'fin' data
-    fin = Language(Langs["fin"], "fin")
+    fin = Language(langs["fin"], "fin")
 
     # These "chars" represent a font with supposedly those codepoints in it
     fin_chars_missing_a = "bcdefghijklmnopqrstuvwxyzäöå"
@@ -59,17 +59,15 @@ def test_language_inherit():
     assert "base" not in aae.get_orthography()
 
 
-def test_language_preferred_name():
-    Langs = Languages()
-    bal = Language(Langs["bal"], "bal")
+def test_language_preferred_name(langs):
+    bal = Language(langs["bal"], "bal")
     #   name: Baluchi
     #   preferred_name: Balochi
     assert bal.get_name() == "Balochi"
 
 
-def test_language_get_autonym():
-    Langs = Languages()
-    bal = Language(Langs["bal"], "bal")
+def test_language_get_autonym(langs):
+    bal = Language(langs["bal"], "bal")
     #   name: Baluchi
     #   - autonym: بلۏچی
     #     script: Arabic
@@ -80,11 +78,10 @@ def test_language_get_autonym():
     assert bal.get_autonym() is False
 
 
-def test_language_all_orthographies():
-    Langs = Languages()
+def test_language_all_orthographies(langs):
     # smj Lule Sami with one primary and one deprecated orthography should
     # always return only the primary
-    smj = Language(Langs["smj"], "smj")
+    smj = Language(langs["smj"], "smj")
     # All the chars from both orthographies
     smj_base = "A B C D E F G H I J K L M N O P Q R S T U V W X Y Z Á Ä Å Ñ Ö Ń a b c d e f g h i j k l m n o p q r s t u v w x y z á ä å ñ ö ń A B D E F G H I J K L M N O P R S T U V Á Ä Å Ŋ a b d e f g h i j k l m n o p r s t u v á ä å ŋ a n o ́ ̃ ̈ ̊"  # noqa
 
@@ -100,7 +97,7 @@ def test_language_all_orthographies():
 
     # rmn Balkan Romani has Latin (primary) and Cyrillic orthographies
     # It should return only Latin by default, but both when listing all
-    rmn = Language(Langs["rmn"], "rmn")
+    rmn = Language(langs["rmn"], "rmn")
 
     # All the chars from both orthographies
     rmj_base = "A B C D E F H I J K L M N O P Q R S T U V W X Y Z a b c d e f h i j k l m n o p q r s t u v w x y z А Б В Г Д Е Ж З И К Л М Н О П Р С Т У Ф Х Ц Ч Ш Ы Ь Э Ю Я а б в г д е ж з и к л м н о п р с т у ф х ц ч ш ы ь э ю я G g ́ ̂ ̆ ̇ ̈ ̌"  # noqa
@@ -119,25 +116,21 @@ def test_language_all_orthographies():
     assert len(rmn["orthographies"]) == 1
 
 
-def test_language_multiple_primaries():
-    Langs = Languages()
-
+def test_language_multiple_primaries(langs):
     # E.g. aat Arvanitika Albanian has exceptionally two `primary`
     # orthographies, a font with support for either should include the language
     aat_latin = "A B C D E F G H I J K L M N O P Q R S T U V W X Y Z a b c d e f g h i j k l m n o p q r s t u v w x y z ̀ ́ ̈ ̧"  # noqa
-    aat = Language(Langs["aat"], "aat")
+    aat = Language(langs["aat"], "aat")
     support = aat.has_support(aat_latin)
     assert ("Latin" in support.keys()) is True
     assert ("Greek" not in support.keys()) is True
     assert len(aat["orthographies"]) == 1
 
 
-def test_language_combined_orthographies():
-    Langs = Languages()
-
+def test_language_combined_orthographies(langs):
     # E.g. Serbian or Japanese have multiple orthographies that should be
     # treated as a combination, e.g. require all for support
-    srp = Language(Langs["srp"], "srp")
+    srp = Language(langs["srp"], "srp")
     srp_cyrillic = 'А Б В Г Д Е Ж З И К Л М Н О П Р С Т У Ф Х Ц Ч Ш Ђ Ј Љ Њ Ћ Џ а б в г д е ж з и к л м н о п р с т у ф х ц ч ш ђ ј љ њ ћ џ ́'  # noqa
     srp_latin = 'A B C D E F G H I J K L M N O P Q R S T U V W X Y Z Đ a b c d e f g h i j k l m n o p q r s t u v w x y z đ ́ ̌'  # noqa
 
@@ -149,7 +142,7 @@ def test_language_combined_orthographies():
 
     # Checking with the combined chars this should now return both
     # orthographies
-    srp = Language(Langs["srp"], "srp")
+    srp = Language(langs["srp"], "srp")
     combined = srp_cyrillic + " " + srp_latin
     support = srp.has_support(combined)
     assert ("Cyrillic" in support) is True
@@ -159,15 +152,13 @@ def test_language_combined_orthographies():
 
     # Checking with --include-all-orthographies should return also a single
     # orthography
-    srp = Language(Langs["srp"], "srp")
+    srp = Language(langs["srp"], "srp")
     support = srp.has_support(srp_latin, checkAllOrthographies=True)
     assert ("Latin" in support) is True
 
 
-def test_get_orthography():
-    Langs = Languages()
-
-    deu = Language(Langs["deu"], "deu")
+def test_get_orthography(langs):
+    deu = Language(langs["deu"], "deu")
 
     # By default and with not parameters it should return the primary
     # orthography
@@ -187,7 +178,7 @@ def test_get_orthography():
     with pytest.raises(KeyError):
         deu.get_orthography(status="constructed")
 
-    bos = Language(Langs["bos"], "bos")
+    bos = Language(langs["bos"], "bos")
 
     # Return a script specific orthography, even if that is not the primary one
     bos_cyrillic = bos.get_orthography("Cyrillic")
@@ -197,3 +188,17 @@ def test_get_orthography():
     # exceptions
     with pytest.raises(KeyError):
         bos.get_orthography("Cyrillic", "primary")
+
+
+def test_language_pickle_copy(langs):
+    fin = Language(langs["fin"], "fin")
+
+    for protocol in range(pickle.HIGHEST_PROTOCOL + 1):
+        restored = pickle.loads(pickle.dumps(fin, protocol))
+        assert type(restored) is Language
+        assert restored == fin
+        assert restored.iso == "fin"
+
+    copied = copy.copy(fin)
+    assert copied == fin
+    assert copied.iso == "fin"
@@ -1,15 +1,16 @@
 import os
+import yaml
 from hyperglot.parse import parse_font_chars
-from hyperglot.languages import Languages
+import hyperglot.languages
+from hyperglot.languages import Languages, load_yaml
 
 
-def test_languages_basic():
+def test_languages_basic(langs):
     path = os.path.abspath("tests/Eczar-v1.004/otf/Eczar-Regular.otf")
 
     chars = parse_font_chars(path)
 
-    Langs = Languages()
-    supported = Langs.get_support_from_chars(chars)
+    supported = langs.get_support_from_chars(chars)
 
     # Detected scripts
     assert "Latin" in supported.keys()
@@ -62,3 +63,59 @@ def test_languages_inherit():
     aeb_attr = set(sorted(list(aeb.keys()) + ["inherit"]))
     arb_attr = set(sorted(list(arb.keys()) + ["inherit"]))
     assert arq_attr == aeb_attr == arb_attr
+
+
+def test_languages_inherit_from_macrolanguage(langs):
+    # Zuni zun has its own orthography and must not get the one of the
+    # Zapotec macrolanguage zap
+    zun = langs["zun"]["orthographies"]
+    zap = langs["zap"]["orthographies"]
+
+    assert len(zun) == 1
+    assert zun[0]["autonym"] == "Shiwiʼma"
+    assert zun[0]["base"] != zap[0]["base"]
+
+
+def test_load_yaml_cache(tmp_path, monkeypatch):
+    cache_dir = str(tmp_path / "cache")
+    monkeypatch.setattr(hyperglot.languages, "CACHE_DIR", cache_dir)
+    path = str(tmp_path / "data.yaml")
+    with open(path, "w") as f:
+        f.write("a: 1\n")
+    os.utime(path, ns=(1, 1))
+
+    assert load_yaml(path) == {"a": 1}
+    caches = os.listdir(cache_dir)
+    assert len(caches) == 1 and caches[0].endswith(".pkl")
+
+    # Without a change of mtime the cached data is used
+    with open(path, "w") as f:
+        f.write("a: 2\n")
+    os.utime(path, ns=(1, 1))
+    assert load_yaml(path) == {"a": 1}
+
+    # A changed mtime invalidates the cache
+    os.utime(path, ns=(2, 2))
+    assert load_yaml(path) == {"a": 2}
+
+    # As does a different hyperglot version
+    with open(path, "w") as f:
+        f.write("a: 3\n")
+    os.utime(path, ns=(2, 2))
+    monkeypatch.setattr(hyperglot.languages, "__version__", "0.0.0")
+    assert load_yaml(path) == {"a": 3}
+
+    # Results of a parse function are cached separately
+    def parse_keys(f):
+        return list(yaml.safe_load(f).keys())
+    assert load_yaml(path, parse_keys) == ["a"]
+    assert len(os.listdir(cache_dir)) == 2
+    assert load_yaml(path) == {"a": 3}
+
+    # A broken cache file is parsed anew and replaced
+    cache = os.path.join(cache_dir, caches[0])
+    with open(cache, "wb") as f:
+        f.write(b"\x80")
+    assert load_yaml(path) == {"a": 3}
+    assert load_yaml(path) == {"a": 3}
+    assert not [c for c in os.listdir(cache_dir) if c.endswith(".tmp")]
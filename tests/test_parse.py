@@ -5,7 +5,8 @@ import os
 from hyperglot.parse import (parse_chars, parse_font_chars, parse_marks,
                              character_list_from_string,
                              sort_by_character_type,
-                             list_unique)
+                             list_unique, is_ascii, is_mark, strip_marks,
+                             prune_superflous_marks)
 
 
 def test_parse_chars():
@@ -63,6 +64,44 @@ def test_list_unique():
     assert ["a", "b", "c"] == list_unique(["a", "a", "b", "c"])
 
 
+def test_is_ascii():
+    assert is_ascii("a b c ' ^")
+    assert is_ascii("")
+    assert not is_ascii("a b ä")
+    assert not is_ascii("a" + chr(int("00A0", 16)) + "b")
+
+
+def test_is_mark():
+    # Combining diaeresis (Mn), Devanagari sign visarga (Mc), combining
+    # enclosing circle (Me)
+    for uni in ["0308", "0903", "20DD"]:
+        assert is_mark(chr(int(uni, 16)))
+
+    # Variation selector 17, outside the lookup table
+    assert is_mark(chr(int("E0100", 16)))
+
+    assert not is_mark("a")
+    assert not is_mark("ä")
+    # Spacing modifier letter, not a mark
+    assert not is_mark("ʼ")
+
+
+def test_strip_marks():
+    assert strip_marks("äa̧") == ["ä", "a"]
+    assert strip_marks(["ä", "̈", "a", "̧"]) == ["ä", "a"]
+    assert strip_marks(["a", chr(int("E0100", 16))]) == ["a"]
+
+
+def test_prune_superflous_marks():
+    # The standalone diaeresis is implicitly part of ä, the ring is not part
+    # of any other character
+    pruned, removed = prune_superflous_marks("a ä ̈ b ̊")
+    assert pruned == ["a", "ä", "b", "̊"]
+    assert removed == ["̈"]
+    assert prune_superflous_marks("ä ö") == (["ä", "ö"], ())
+    assert prune_superflous_marks("a b") == (["a", "b"], ())
+
+
 def test_parse_font_chars():
     path = os.path.abspath("tests/Eczar-v1.004/otf/Eczar-Regular.otf")
     chars = parse_font_chars(path)
@@ -0,0 +1,26 @@
+import yaml
+from hyperglot.languages import SafeLoader
+from hyperglot.validate import check_includes, parse_iso_names, ISO_DB
+
+
+def test_parse_iso_names():
+    with open(ISO_DB) as f:
+        iso_data = yaml.load(f, Loader=SafeLoader)
+    with open(ISO_DB) as f:
+        names = parse_iso_names(f)
+
+    assert names == {iso: data.get("names", [])
+                     for iso, data in iso_data.items()}
+
+    # Aliased values do not throw off the keys that follow them
+    stream = ("aaa: {other: &x [1], names: [A]}\n"
+              "bbb: {other: *x, names: [B]}\n"
+              "ccc: {names: [C], other: *x}\n")
+    assert parse_iso_names(stream) == {"aaa": ["A"], "bbb": ["B"],
+                                       "ccc": ["C"]}
+
+
+def test_check_includes():
+    assert check_includes({"includes": []}) is False
+    assert check_includes({"includes": ["abc"]}) is True
+    assert check_includes({}) is False